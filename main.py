@@ -15,29 +15,60 @@ You can deploy this application to Cloud Run by building the container image an
 
 import os
 import io
+import re
 import uuid
-from typing import List, Dict
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Optional
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from flask_compress import Compress
 
 from google.cloud import storage  # type: ignore
 from google.cloud import firestore  # type: ignore
 from google.cloud import documentai_v1 as documentai  # type: ignore
 from google.cloud import documentai_v1beta3 as documentai_beta  # type: ignore
-from jinja2 import Template  # type: ignore
-import pdfkit  # type: ignore
+from google.api_core import exceptions as core_exceptions  # type: ignore
+from google.api_core import grpc_helpers, retry  # type: ignore
+from jinja2 import Environment, FileSystemLoader  # type: ignore
+from weasyprint import HTML  # type: ignore
+from weasyprint.text.fonts import FontConfiguration  # type: ignore
 from pypdf import PdfReader, PdfWriter  # type: ignore
-from datetime import datetime
-from google.protobuf.json_format import MessageToDict  # type: ignore
-import json
+from datetime import date, datetime
+import orjson  # type: ignore
 
 # Maximum pages per chunk for Document AI Custom Extractor
 MAX_PAGES_PER_CHUNK = 15
+# Upper bound on chunks of one document sent to the extractor at the same time
+MAX_CONCURRENT_CHUNKS = 8
+# Upper bound on files of one /upload request uploaded and extracted at the same time
+MAX_CONCURRENT_FILES = 8
+
+# Date of birth format used on the uploaded reports (MM/DD/YYYY)
+_DOB_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+# Patterns used on every field of every report; compiled once at import
+_DIGIT_RE = re.compile(r"\d+")
+_SLASH_SCORE_RE = re.compile(r"(\d+)\s*/\s*\d+")
+_NONALNUM_RE = re.compile(r"[^a-z0-9]+")
 
 app = Flask(__name__)
 CORS(app)
 
+# Werkzeug enforces this while it streams the multipart body, so oversized
+# uploads are rejected with 413 before they are spooled in full.
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_UPLOAD_MB", "100")) * 1024 * 1024
+
+# gzip JSON/HTML responses for clients that accept it; /upload returns the full
+# report HTML and /reports can hold up to 1000 records.
+app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/html"]
+app.config["COMPRESS_LEVEL"] = 5
+Compress(app)
+
 PROJECT_ID = os.getenv("PROJECT_ID")
 OCR_LOCATION = os.getenv("OCR_LOCATION", os.getenv("LOCATION", "us"))
 PROCESSOR_ID = os.getenv("PROCESSOR_ID")
@@ -51,15 +82,96 @@ GEN_EXTRACTOR_LOCATION = os.getenv("GEN_EXTRACTOR_LOCATION", os.getenv("EXTRACTO
 # REPORT_TEMPLATE_PATH environment variable when deploying.
 TEMPLATE_PATH = os.getenv("REPORT_TEMPLATE_PATH", "report_template.html.jinja")
 
+# The template is immutable at runtime, so parse and compile it once at import
+# and never stat the file again to check for changes.
+_TEMPLATE = Environment(
+    loader=FileSystemLoader(os.path.dirname(TEMPLATE_PATH) or "."),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1,
+).get_template(os.path.basename(TEMPLATE_PATH))
+
+# When enabled, multi-file uploads are sent to the extractor as a single
+# batch_process_documents request instead of one online request per file.
+USE_BATCH_EXTRACTION = os.getenv("USE_BATCH_EXTRACTION", "").lower() in ("1", "true", "yes")
+BATCH_TIMEOUT_SECONDS = int(os.getenv("BATCH_TIMEOUT_SECONDS", "600"))
+# Intermediate objects (batch extractor output) are written under this prefix
+# and left for a bucket lifecycle rule to expire, instead of being deleted
+# inline during the request.
+TMP_PREFIX = "tmp/"
+
+
+# Google Cloud clients are expensive to build (credential discovery, gRPC
+# channel setup) and are thread-safe, so each one is created lazily on first
+# use and shared for the lifetime of the process.
+_client_lock = threading.Lock()
+_storage_client = None
+_firestore_client = None
+_docai_clients: Dict[tuple, object] = {}
+_docai_channels: Dict[str, object] = {}
+
+# Options for the shared Document AI channels: keep the GAPIC defaults of no
+# message size cap (PDF payloads are large) and ping idle connections so the
+# channel stays warm between requests.
+_DOCAI_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+]
+
 
 def get_storage_client() -> storage.Client:
-    """Instantiate and return a Cloud Storage client."""
-    return storage.Client(project=PROJECT_ID)
+    """Return the shared Cloud Storage client, creating it on first use."""
+    global _storage_client
+    if _storage_client is None:
+        with _client_lock:
+            if _storage_client is None:
+                _storage_client = storage.Client(project=PROJECT_ID)
+    return _storage_client
 
 
 def get_firestore_client() -> firestore.Client:
-    """Instantiate and return a Firestore client."""
-    return firestore.Client(project=PROJECT_ID)
+    """Return the shared Firestore client, creating it on first use."""
+    global _firestore_client
+    if _firestore_client is None:
+        with _client_lock:
+            if _firestore_client is None:
+                _firestore_client = firestore.Client(project=PROJECT_ID)
+    return _firestore_client
+
+
+def get_docai_client(location: str, beta: bool = False):
+    """Return the shared Document AI client for a regional endpoint.
+
+    Args:
+        location: Document AI region, e.g. `us`.
+        beta: Use the v1beta3 client instead of v1.
+
+    Returns:
+        A `DocumentProcessorServiceClient`, reused across calls with the same endpoint/version.
+        Clients for the same endpoint are built on one shared gRPC channel.
+    """
+    api_endpoint = f"{location}-documentai.googleapis.com"
+    key = (api_endpoint, beta)
+    client = _docai_clients.get(key)
+    if client is None:
+        with _client_lock:
+            client = _docai_clients.get(key)
+            if client is None:
+                # v1 and v1beta3 clients for the same region share one gRPC channel
+                channel = _docai_channels.get(api_endpoint)
+                if channel is None:
+                    channel = grpc_helpers.create_channel(
+                        f"{api_endpoint}:443",
+                        scopes=["https://www.googleapis.com/auth/cloud-platform"],
+                        options=_DOCAI_CHANNEL_OPTIONS,
+                    )
+                    _docai_channels[api_endpoint] = channel
+                client_cls = (documentai_beta if beta else documentai).DocumentProcessorServiceClient
+                transport = client_cls.get_transport_class("grpc")(host=api_endpoint, channel=channel)
+                client = client_cls(transport=transport)
+                _docai_clients[key] = client
+    return client
 
 
 def split_pdf_into_chunks(pdf_bytes: bytes, max_pages: int = MAX_PAGES_PER_CHUNK) -> List[bytes]:
@@ -82,19 +194,21 @@ def split_pdf_into_chunks(pdf_bytes: bytes, max_pages: int = MAX_PAGES_PER_CHUNK
     for start in range(0, total_pages, max_pages):
         writer = PdfWriter()
         end = min(start + max_pages, total_pages)
-        for page_num in range(start, end):
-            writer.add_page(reader.pages[page_num])
+        # Copy the page range from the already-parsed reader in one call
+        writer.append(reader, pages=(start, end), import_outline=False)
 
         chunk_buffer = io.BytesIO()
         writer.write(chunk_buffer)
-        chunk_buffer.seek(0)
-        chunks.append(chunk_buffer.read())
+        chunks.append(chunk_buffer.getvalue())
 
     return chunks
 
 
 def delete_blob(gcs_uri: str) -> None:
-    """Delete a blob from Cloud Storage given its GCS URI."""
+    """Delete a blob from Cloud Storage given its GCS URI.
+
+    Kept for administrative cleanup; request handlers leave temporary objects
+    under TMP_PREFIX to the bucket lifecycle rule instead."""
     if not gcs_uri.startswith("gs://"):
         return
     _, _, rest = gcs_uri.partition("gs://")
@@ -120,32 +234,13 @@ def process_document(content: bytes, mime_type: str = "application/pdf") -> docu
     if not (PROJECT_ID and PROCESSOR_ID):
         raise RuntimeError("PROJECT_ID and PROCESSOR_ID must be set in environment variables")
     name = f"projects/{PROJECT_ID}/locations/{PROCESSOR_LOCATION}/processors/{PROCESSOR_ID}"
-    client = documentai.DocumentProcessorServiceClient(client_options={"api_endpoint": f"{OCR_LOCATION}-documentai.googleapis.com"})
+    client = get_docai_client(OCR_LOCATION)
     raw_document = documentai.RawDocument(content=content, mime_type=mime_type)
     request = documentai.ProcessRequest(name=name, raw_document=raw_document)
     result = client.process_document(request=request)
     return result.document
 
 
-def upload_to_bucket(file_obj, filename: str) -> str:
-    """Upload the file object to the configured bucket and return its public URI.
-
-    Args:
-        file_obj: A file-like object positioned at the beginning of the file.
-        filename: Name to use for the blob in Cloud Storage.
-
-    Returns:
-        The URI of the uploaded object (gs://bucket/file).
-    """
-    if not BUCKET_NAME:
-        raise RuntimeError("BUCKET_NAME must be set in environment variables")
-    client = get_storage_client()
-    bucket = client.bucket(BUCKET_NAME)
-    blob = bucket.blob(filename)
-    # Upload file content
-    blob.upload_from_file(file_obj)
-    return f"gs://{BUCKET_NAME}/{filename}"
-
 def upload_json_to_bucket(data: Dict, filename: str) -> str:
     """Upload a JSON-serializable dictionary as a JSON file to Cloud Storage.
 
@@ -161,7 +256,7 @@ def upload_json_to_bucket(data: Dict, filename: str) -> str:
     client = get_storage_client()
     bucket = client.bucket(BUCKET_NAME)
     blob = bucket.blob(filename)
-    blob.upload_from_string(json.dumps(data), content_type="application/json")
+    blob.upload_from_string(orjson.dumps(data), content_type="application/json")
     return f"gs://{BUCKET_NAME}/{filename}"
 
 def upload_bytes_to_bucket(data: bytes, filename: str, content_type: str = "application/octet-stream") -> str:
@@ -183,253 +278,238 @@ def upload_bytes_to_bucket(data: bytes, filename: str, content_type: str = "appl
     blob.upload_from_string(data, content_type=content_type)
     return f"gs://{BUCKET_NAME}/{filename}"
 
+# Interpretation bands as (thresholds, labels). Scores are integers, so
+# bisect_right(thresholds, score) is the index of the band the score falls in.
+_DYSFUNCTION_BANDS = (
+    (25, 50, 75),
+    ("Severe dysfunction \U0001F6A9", "Moderate dysfunction \U0001F7E0", "Mild dysfunction \U0001F7E1", "Normal"),
+)
+_PERCENTILE_BANDS = ((25, 75), ("Abnormal", "Below Average", "Normal"))
+_PSY_BANDS = {
+    "rpq": (
+        (16, 36),
+        (
+            "Not indicative of Post-Concussion Syndrome",
+            "Indicative of Post-Concussion Syndrome \U0001F7E0",
+            "PCS; predictive of moderate–severe functional limitations \U0001F6A9",
+        ),
+    ),
+    "pcl": (
+        (31, 34),
+        (
+            "Sub-threshold; does not meet criteria for PTSD",
+            "Probable PTSD \U0001F7E0",
+            "Significant likelihood of PTSD \U0001F6A9",
+        ),
+    ),
+    "psqi": ((6,), ("Good sleep quality", "Poor sleep quality \U0001F6A9")),
+    "phq": (
+        (5, 10, 15, 20),
+        (
+            "Minimal depression",
+            "Mild depression \U0001F7E1",
+            "Moderate depression \U0001F7E0",
+            "Moderately severe depression \U0001F6A9",
+            "Severe depression \U0001F6A9",
+        ),
+    ),
+    "gad": (
+        (5, 10, 15),
+        ("Minimal anxiety", "Mild anxiety \U0001F7E1", "Moderate anxiety \U0001F7E0", "Severe anxiety \U0001F6A9"),
+    ),
+}
+
 def interpret_dysfunction(score: int) -> str:
     """Return qualitative interpretation based on dysfunction score."""
-    if score <= 24:
-        return "Severe dysfunction \U0001F6A9"
-    elif score < 50:
-        return "Moderate dysfunction \U0001F7E0"
-    elif score < 75:
-        return "Mild dysfunction \U0001F7E1"
-    else:
-        return "Normal"
+    thresholds, labels = _DYSFUNCTION_BANDS
+    return labels[bisect_right(thresholds, score)]
 
 def interpret_percentile(pct: int) -> str:
     """Interpret percentile scores for posturography fields."""
-    if pct < 25:
-        return "Abnormal"
-    elif pct < 75:
-        return "Below Average"
-    else:
-        return "Normal"
+    thresholds, labels = _PERCENTILE_BANDS
+    return labels[bisect_right(thresholds, pct)]
 
 def interpret_psy_score(score: int, scale: str) -> str:
     """Interpret neuropsychiatric scores."""
-    if scale == "rpq":
-        if score < 16:
-            return "Not indicative of Post-Concussion Syndrome"
-        elif score <= 35:
-            return "Indicative of Post-Concussion Syndrome \U0001F7E0"
-        else:
-            return "PCS; predictive of moderate–severe functional limitations \U0001F6A9"
-    if scale == "pcl":
-        if score < 31:
-            return "Sub-threshold; does not meet criteria for PTSD"
-        elif score <= 33:
-            return "Probable PTSD \U0001F7E0"
-        else:
-            return "Significant likelihood of PTSD \U0001F6A9"
-    if scale == "psqi":
-        return "Good sleep quality" if score <= 5 else "Poor sleep quality \U0001F6A9"
-    if scale == "phq":
-        if score <= 4:
-            return "Minimal depression"
-        elif score <= 9:
-            return "Mild depression \U0001F7E1"
-        elif score <= 14:
-            return "Moderate depression \U0001F7E0"
-        elif score <= 19:
-            return "Moderately severe depression \U0001F6A9"
-        else:
-            return "Severe depression \U0001F6A9"
-    if scale == "gad":
-        if score <= 4:
-            return "Minimal anxiety"
-        elif score <= 9:
-            return "Mild anxiety \U0001F7E1"
-        elif score <= 14:
-            return "Moderate anxiety \U0001F7E0"
-        else:
-            return "Severe anxiety \U0001F6A9"
-    return ""
-
-def render_report(fields: Dict, patient_name: str, dob: str, doi: str, dos: str, vng: bool, ct_sib: bool, creyos: bool, sex: str = "") -> str:
-    """Render the final interpretation report using a Jinja2 template."""
-    import re
-    
-    def _parse_percentile(val) -> int:
-        """Parse a percentile value, stripping %, ordinal suffixes, and extracting just the number.
-        Caps at 100 since percentiles can't exceed that."""
-        if val is None:
-            return 0
-        s = str(val).replace("%", "").replace("nd", "").replace("rd", "").replace("th", "").replace("st", "").strip()
-        match = re.search(r'\d+', s)
-        if match:
-            pct = int(match.group())
-            # Cap at 100 - if over 100, likely an OCR error (e.g., "102" should be "10" or "2")
-            return min(pct, 100)
+    bands = _PSY_BANDS.get(scale)
+    if bands is None:
+        return ""
+    thresholds, labels = bands
+    return labels[bisect_right(thresholds, score)]
+
+def _parse_percentile(val) -> int:
+    """Parse a percentile value by taking its first digit run, which skips % and ordinal suffixes.
+    Caps at 100 since percentiles can't exceed that."""
+    if val is None:
         return 0
-    
-    def _parse_int(val, default=0) -> int:
-        """Parse an integer value safely."""
-        if val is None:
-            return default
-        s = str(val).strip()
-        match = re.search(r'\d+', s)
-        return int(match.group()) if match else default
-    
-    def _parse_score_with_total(val, default=0) -> int:
-        """Parse a score that may be in 'X/Y' format (e.g., '27/64'). Returns just X."""
-        if val is None:
-            return default
-        s = str(val).strip()
-        # Check for X/Y format
-        slash_match = re.match(r'(\d+)\s*/\s*\d+', s)
-        if slash_match:
-            return int(slash_match.group(1))
-        # Otherwise just get first number
-        match = re.search(r'\d+', s)
-        return int(match.group()) if match else default
-    
-    def _task_interpretation(pct: int) -> str:
-        """Interpret cognitive task percentile."""
-        return "Below Average" if pct < 20 else "Within Typical Range"
-    
-    # Compute age from date of birth
-    age = ""
+    match = _DIGIT_RE.search(str(val))
+    if match:
+        pct = int(match.group())
+        # Cap at 100 - if over 100, likely an OCR error (e.g., "102" should be "10" or "2")
+        return min(pct, 100)
+    return 0
+
+def _parse_int(val, default=0) -> int:
+    """Parse an integer value safely."""
+    if val is None:
+        return default
+    s = str(val).strip()
+    match = _DIGIT_RE.search(s)
+    return int(match.group()) if match else default
+
+def _parse_score_with_total(val, default=0) -> int:
+    """Parse a score that may be in 'X/Y' format (e.g., '27/64'). Returns just X."""
+    if val is None:
+        return default
+    s = str(val).strip()
+    # Check for X/Y format
+    slash_match = _SLASH_SCORE_RE.match(s)
+    if slash_match:
+        return int(slash_match.group(1))
+    # Otherwise just get first number
+    match = _DIGIT_RE.search(s)
+    return int(match.group()) if match else default
+
+def _task_interpretation(pct: int) -> str:
+    """Interpret cognitive task percentile."""
+    return "Below Average" if pct < 20 else "Within Typical Range"
+
+@lru_cache(maxsize=4096)
+def _age_from_dob(dob: str, today: date):
+    """Return whole years between an MM/DD/YYYY date of birth and `today`, or "" if it doesn't parse."""
+    match = _DOB_RE.fullmatch(dob) if isinstance(dob, str) else None
+    if not match:
+        return ""
+    month, day, year = map(int, match.groups())
     try:
-        age = (datetime.now().date() - datetime.strptime(dob, "%m/%d/%Y").date()).days // 365
-    except Exception:
-        age = ""
-    
+        return (today - date(year, month, day)).days // 365
+    except ValueError:
+        return ""
+
+def _parse_score_out_of(val, total: int, clamp_fallback: bool = True) -> int:
+    """Parse an 'X/total' score, repairing OCR that dropped the slash.
+
+    A value above `total` such as "2764" is most likely "27/64" read without
+    the slash, so split off a trailing `total` if there is one. Otherwise take
+    the first 2 digits (or just 1 if `clamp_fallback` and 2 would exceed `total`)."""
+    score = _parse_score_with_total(val)
+    if score <= total:
+        return score
+    score_str = str(score)
+    suffix = str(total)
+    for split_pos in range(1, len(score_str)):
+        numerator = int(score_str[:split_pos])
+        if score_str[split_pos:] == suffix and numerator <= total:
+            return numerator
+    if len(score_str) >= 2:
+        first_two = int(score_str[:2])
+        if clamp_fallback and first_two > total:
+            return int(score_str[:1])
+        return first_two
+    return score
+
+# Posturography percentiles: (template prefix, merged field key)
+_POSTUROGRAPHY_FIELDS = (
+    ("standard", "standard_score_percentile"),
+    ("proprioception", "proprioception_score_percentile"),
+    ("visual", "visual_score_percentile"),
+    ("vestibular", "vestibular_score_percentile"),
+)
+
+# Neuropsychiatric scores: (template prefix, merged field key, max score, clamp fallback, scale)
+_PSY_SCORE_FIELDS = (
+    ("rpq", "rpq score", 64, False, "rpq"),
+    ("pcl_5", "pcl-5 score", 80, False, "pcl"),
+    ("psqi", "psqi score", 21, True, "psqi"),
+    ("phq_9", "phq-9 score", 27, True, "phq"),
+    ("gad_7", "gad-7 score", 21, True, "gad"),
+)
+
+# Cognitive test percentiles: (template prefix, merged field key)
+_COGNITIVE_FIELDS = (
+    ("visuospatial_wm", "Visuospatial working memory test"),
+    ("working_memory", "Working memory test"),
+    ("spatial_stm", "Spatial short-term memory test"),
+    ("verbal_stm", "Verbal short-term memory"),
+    ("episodic_memory", "Episodic memory"),
+    ("polygons", "Polygons"),
+    ("mental_rotation", "Mental Rotation"),
+    ("deductive_reasoning", "Deductive Reasoning"),
+    ("verbal_reasoning", "Verbal Reasoning"),
+    ("attention", "Attention"),
+    ("planning", "Planning"),
+    ("response_inhibition", "Response Inhibition"),
+)
+
+# Cognitive domains: (domain, tasks, actual values below 20 needed to call it impaired)
+_COGNITIVE_DOMAINS = (
+    ("memory", ("visuospatial_wm", "working_memory", "spatial_stm", "verbal_stm", "episodic_memory"), 2),
+    ("visuospatial", ("polygons", "mental_rotation"), 2),
+    ("reasoning", ("deductive_reasoning", "verbal_reasoning"), 2),
+    # Single-task domain: impaired if the task exists and is below threshold
+    ("attention", ("attention",), 1),
+    ("executive", ("planning", "response_inhibition"), 2),
+)
+
+def render_report(fields: Dict, patient_name: str, dob: str, doi: str, dos: str, vng: bool, ct_sib: bool, creyos: bool, sex: str = "", now: Optional[datetime] = None) -> str:
+    """Render the final interpretation report using a Jinja2 template.
+
+    `fields` must already be merged through _ALIAS_MAP, so each score is read
+    from its one canonical key. `now` is the request timestamp used for the
+    patient's age; defaults to the current time."""
+    # Compute age from date of birth
+    age = _age_from_dob(dob, (now or datetime.now()).date())
+
+    context = {}
+
     # Oculomotor scores
-    pursuits_score = _parse_int(fields.get("pursuits_score") or fields.get("pursuits score"))
-    saccades_score = _parse_int(fields.get("saccades_score") or fields.get("Saccades Score"))
-    raw_fx = str(fields.get("fixations_score") or fields.get("Fixations score") or "").strip()
+    pursuits_score = _parse_int(fields.get("pursuits score"))
+    saccades_score = _parse_int(fields.get("Saccades Score"))
+    raw_fx = str(fields.get("Fixations score") or "").strip()
     fixations_score = _parse_int(raw_fx) if raw_fx else None
-    raw_ds = str(fields.get("dysfunctional_scale") or fields.get("Dysfunctional scale") or fields.get("eyeq_score") or "").strip()
+    raw_ds = str(fields.get("Dysfunctional scale") or "").strip()
     dysfunctional_scale = _parse_int(raw_ds) if raw_ds else None
+    context.update(
+        pursuits_score=pursuits_score,
+        saccades_score=saccades_score,
+        fixations_score=fixations_score,
+        dysfunctional_scale=dysfunctional_scale,
+        pursuits_interpretation=interpret_dysfunction(pursuits_score),
+        saccades_interpretation=interpret_dysfunction(saccades_score),
+        fixations_interpretation=(interpret_dysfunction(fixations_score) if isinstance(fixations_score, int) else "N/A"),
+        dysfunctional_interpretation=(interpret_dysfunction(dysfunctional_scale) if isinstance(dysfunctional_scale, int) else "N/A"),
+    )
 
     # Posturography percentiles
-    standard_score = _parse_percentile(fields.get("standard_score_percentile"))
-    proprio_score = _parse_percentile(fields.get("proprioception_score_percentile"))
-    visual_score = _parse_percentile(fields.get("visual_score_percentile"))
-    vestibular_score = _parse_percentile(fields.get("vestibular_score_percentile"))
-    
+    for name, key in _POSTUROGRAPHY_FIELDS:
+        pct = _parse_percentile(fields.get(key))
+        context[f"{name}_score"] = pct
+        context[f"{name}_interpretation"] = interpret_percentile(pct)
+
     # Neuropsychiatric scores
-    # RPQ score is typically "X/64" format. If we get something like "2764", extract just the first part
-    raw_rpq = fields.get("rpq_score") or fields.get("rpq score") or ""
-    rpq_score = _parse_score_with_total(raw_rpq)
-    # RPQ max is 64 - if higher, it's likely "27/64" read as "2764", so extract first 2 digits
-    if rpq_score > 64:
-        rpq_str = str(rpq_score)
-        # Try to split at reasonable boundaries (64 is the denominator)
-        for split_pos in range(1, len(rpq_str)):
-            numerator = int(rpq_str[:split_pos])
-            denominator = rpq_str[split_pos:]
-            if denominator == "64" and numerator <= 64:
-                rpq_score = numerator
-                break
-        else:
-            # If we can't find "64" suffix, just take first 2 digits
-            rpq_score = int(rpq_str[:2]) if len(rpq_str) >= 2 else rpq_score
-    # PCL-5: max score is 80, format is "X/80"
-    raw_pcl = fields.get("pcl_5_score") or fields.get("pcl-5 score") or ""
-    pcl_5_score = _parse_score_with_total(raw_pcl)
-    if pcl_5_score > 80:
-        pcl_str = str(pcl_5_score)
-        # Try to find "80" as the denominator
-        for split_pos in range(1, len(pcl_str)):
-            numerator = int(pcl_str[:split_pos])
-            denominator = pcl_str[split_pos:]
-            if denominator == "80" and numerator <= 80:
-                pcl_5_score = numerator
-                break
-        else:
-            # If can't find "80", take first 2 digits if reasonable
-            if len(pcl_str) >= 2:
-                pcl_5_score = int(pcl_str[:2])
-    
-    # PSQI: max score is 21, format is "X/21"
-    raw_psqi = fields.get("psqi_score") or fields.get("psqi score") or ""
-    psqi_score = _parse_score_with_total(raw_psqi)
-    if psqi_score > 21:
-        psqi_str = str(psqi_score)
-        for split_pos in range(1, len(psqi_str)):
-            numerator = int(psqi_str[:split_pos])
-            denominator = psqi_str[split_pos:]
-            if denominator == "21" and numerator <= 21:
-                psqi_score = numerator
-                break
-        else:
-            if len(psqi_str) >= 2:
-                psqi_score = int(psqi_str[:2]) if int(psqi_str[:2]) <= 21 else int(psqi_str[:1])
-    
-    # PHQ-9: max score is 27, format is "X/27"
-    raw_phq = fields.get("phq_9_score") or fields.get("phq-9 score") or ""
-    phq_9_score = _parse_score_with_total(raw_phq)
-    if phq_9_score > 27:
-        phq_str = str(phq_9_score)
-        for split_pos in range(1, len(phq_str)):
-            numerator = int(phq_str[:split_pos])
-            denominator = phq_str[split_pos:]
-            if denominator == "27" and numerator <= 27:
-                phq_9_score = numerator
-                break
-        else:
-            if len(phq_str) >= 2:
-                phq_9_score = int(phq_str[:2]) if int(phq_str[:2]) <= 27 else int(phq_str[:1])
-    
-    # GAD-7: max score is 21, format is "X/21"
-    raw_gad = fields.get("gad_7_score") or fields.get("gad-7 score") or ""
-    gad_7_score = _parse_score_with_total(raw_gad)
-    if gad_7_score > 21:
-        gad_str = str(gad_7_score)
-        for split_pos in range(1, len(gad_str)):
-            numerator = int(gad_str[:split_pos])
-            denominator = gad_str[split_pos:]
-            if denominator == "21" and numerator <= 21:
-                gad_7_score = numerator
-                break
-        else:
-            if len(gad_str) >= 2:
-                gad_7_score = int(gad_str[:2]) if int(gad_str[:2]) <= 21 else int(gad_str[:1])
-    
-    # Cognitive test percentiles
-    visuospatial_wm = _parse_percentile(fields.get("visuospatial_working_memory_percentile") or fields.get("Visuospatial working memory test"))
-    working_memory = _parse_percentile(fields.get("working_memory_percentile") or fields.get("Working memory test"))
-    spatial_stm = _parse_percentile(fields.get("spatial_short_term_memory_percentile") or fields.get("Spatial short-term memory test"))
-    verbal_stm = _parse_percentile(fields.get("verbal_short_term_memory_percentile") or fields.get("Verbal short-term memory"))
-    episodic_memory = _parse_percentile(fields.get("episodic_memory_percentile") or fields.get("Episodic memory"))
-    polygons = _parse_percentile(fields.get("polygons_percentile") or fields.get("Polygons"))
-    mental_rotation = _parse_percentile(fields.get("mental_rotation_percentile") or fields.get("Mental Rotation"))
-    deductive_reasoning = _parse_percentile(fields.get("deductive_reasoning_percentile") or fields.get("Deductive Reasoning"))
-    verbal_reasoning = _parse_percentile(fields.get("verbal_reasoning_percentile") or fields.get("Verbal Reasoning"))
-    attention = _parse_percentile(fields.get("attention_percentile") or fields.get("Attention"))
-    planning = _parse_percentile(fields.get("planning_percentile") or fields.get("Planning"))
-    response_inhibition = _parse_percentile(fields.get("response_inhibition_percentile") or fields.get("Response Inhibition"))
-    
-    # Check if we have cognitive domain data
-    memory_tasks = [visuospatial_wm, working_memory, spatial_stm, verbal_stm, episodic_memory]
-    visuospatial_tasks = [polygons, mental_rotation]
-    reasoning_tasks = [deductive_reasoning, verbal_reasoning]
-    attention_tasks = [attention]
-    executive_tasks = [planning, response_inhibition]
-    
-    # Filter out zero/missing values for determining presence
-    has_cognitive = any(t > 0 for t in memory_tasks + visuospatial_tasks + reasoning_tasks + attention_tasks + executive_tasks)
-    
-    # Domain interpretations - only count actual values (> 0) when determining impairment
-    def domain_impaired(tasks, threshold=20, min_count=2):
-        """Check if domain is impaired based on actual (non-zero) task values."""
-        actual_tasks = [t for t in tasks if t > 0]
-        if len(actual_tasks) < min_count:
-            return False  # Not enough data to determine impairment
-        below = sum(1 for t in actual_tasks if t < threshold)
-        return below >= min_count
-    
-    memory_impaired = domain_impaired(memory_tasks, min_count=2)
-    visuospatial_impaired = domain_impaired(visuospatial_tasks, min_count=2)
-    reasoning_impaired = domain_impaired(reasoning_tasks, min_count=2)
-    # For single-task domains, impaired if the task exists and is below threshold
-    attention_impaired = any(t > 0 and t < 20 for t in attention_tasks)
-    executive_impaired = domain_impaired(executive_tasks, min_count=2)
-    
-    # Load template (HTML)
-    with open(TEMPLATE_PATH) as tf:
-        template = Template(tf.read())
-    
-    return template.render(
+    for name, key, total, clamp_fallback, scale in _PSY_SCORE_FIELDS:
+        score = _parse_score_out_of(fields.get(key), total, clamp_fallback)
+        context[f"{name}_score"] = score
+        context[f"{name}_interpretation"] = interpret_psy_score(score, scale)
+
+    # Cognitive test percentiles; zero means missing
+    percentiles = {}
+    for name, key in _COGNITIVE_FIELDS:
+        pct = _parse_percentile(fields.get(key))
+        percentiles[name] = pct
+        context[f"{name}_percentile"] = pct if pct > 0 else None
+        context[f"{name}_interpretation"] = _task_interpretation(pct)
+    context["cognitive_domains"] = any(pct > 0 for pct in percentiles.values())
+
+    # Domain interpretations - only count actual values (> 0) when determining impairment.
+    # Needing `min_count` actual values below threshold also covers the
+    # "not enough data" case, so one pass over the raw values suffices.
+    for domain, tasks, min_count in _COGNITIVE_DOMAINS:
+        impaired = sum(1 for task in tasks if 0 < percentiles[task] < 20) >= min_count
+        context[f"{domain}_impaired"] = impaired
+        context[f"{domain}_domain_interpretation"] = "Impaired \U0001F6A9" if impaired else "Not Impaired"
+
+    return _TEMPLATE.render(
         patient_full_name=patient_name,
         sex=sex,
         dob=dob,
@@ -439,73 +519,17 @@ def render_report(fields: Dict, patient_name: str, dob: str, doi: str, dos: str,
         vng=vng,
         ct_sib=ct_sib,
         creyos=creyos,
-        pursuits_score=pursuits_score,
-        saccades_score=saccades_score,
-        fixations_score=fixations_score,
-        dysfunctional_scale=dysfunctional_scale,
-        pursuits_interpretation=interpret_dysfunction(pursuits_score),
-        saccades_interpretation=interpret_dysfunction(saccades_score),
-        fixations_interpretation=(interpret_dysfunction(fixations_score) if isinstance(fixations_score, int) else "N/A"),
-        dysfunctional_interpretation=(interpret_dysfunction(dysfunctional_scale) if isinstance(dysfunctional_scale, int) else "N/A"),
-        standard_score=standard_score,
-        proprioception_score=proprio_score,
-        visual_score=visual_score,
-        vestibular_score=vestibular_score,
-        standard_interpretation=interpret_percentile(standard_score),
-        proprioception_interpretation=interpret_percentile(proprio_score),
-        visual_interpretation=interpret_percentile(visual_score),
-        vestibular_interpretation=interpret_percentile(vestibular_score),
-        rpq_score=rpq_score,
-        pcl_5_score=pcl_5_score,
-        psqi_score=psqi_score,
-        phq_9_score=phq_9_score,
-        gad_7_score=gad_7_score,
-        rpq_interpretation=interpret_psy_score(rpq_score, "rpq"),
-        pcl_5_interpretation=interpret_psy_score(pcl_5_score, "pcl"),
-        psqi_interpretation=interpret_psy_score(psqi_score, "psqi"),
-        phq_9_interpretation=interpret_psy_score(phq_9_score, "phq"),
-        gad_7_interpretation=interpret_psy_score(gad_7_score, "gad"),
-        cognitive_domains=has_cognitive,
-        visuospatial_wm_percentile=visuospatial_wm if visuospatial_wm > 0 else None,
-        visuospatial_wm_interpretation=_task_interpretation(visuospatial_wm),
-        working_memory_percentile=working_memory if working_memory > 0 else None,
-        working_memory_interpretation=_task_interpretation(working_memory),
-        spatial_stm_percentile=spatial_stm if spatial_stm > 0 else None,
-        spatial_stm_interpretation=_task_interpretation(spatial_stm),
-        verbal_stm_percentile=verbal_stm if verbal_stm > 0 else None,
-        verbal_stm_interpretation=_task_interpretation(verbal_stm),
-        episodic_memory_percentile=episodic_memory if episodic_memory > 0 else None,
-        episodic_memory_interpretation=_task_interpretation(episodic_memory),
-        polygons_percentile=polygons if polygons > 0 else None,
-        polygons_interpretation=_task_interpretation(polygons),
-        mental_rotation_percentile=mental_rotation if mental_rotation > 0 else None,
-        mental_rotation_interpretation=_task_interpretation(mental_rotation),
-        deductive_reasoning_percentile=deductive_reasoning if deductive_reasoning > 0 else None,
-        deductive_reasoning_interpretation=_task_interpretation(deductive_reasoning),
-        verbal_reasoning_percentile=verbal_reasoning if verbal_reasoning > 0 else None,
-        verbal_reasoning_interpretation=_task_interpretation(verbal_reasoning),
-        attention_percentile=attention if attention > 0 else None,
-        attention_interpretation=_task_interpretation(attention),
-        planning_percentile=planning if planning > 0 else None,
-        planning_interpretation=_task_interpretation(planning),
-        response_inhibition_percentile=response_inhibition if response_inhibition > 0 else None,
-        response_inhibition_interpretation=_task_interpretation(response_inhibition),
-        memory_domain_interpretation="Impaired \U0001F6A9" if memory_impaired else "Not Impaired",
-        visuospatial_domain_interpretation="Impaired \U0001F6A9" if visuospatial_impaired else "Not Impaired",
-        reasoning_domain_interpretation="Impaired \U0001F6A9" if reasoning_impaired else "Not Impaired",
-        attention_domain_interpretation="Impaired \U0001F6A9" if attention_impaired else "Not Impaired",
-        executive_domain_interpretation="Impaired \U0001F6A9" if executive_impaired else "Not Impaired",
-        memory_impaired=memory_impaired,
-        visuospatial_impaired=visuospatial_impaired,
-        reasoning_impaired=reasoning_impaired,
-        attention_impaired=attention_impaired,
-        executive_impaired=executive_impaired,
+        **context,
     )
 
+# Fontconfig setup is the slow part of WeasyPrint's first render; reuse it
+_FONT_CONFIG = FontConfiguration()
+
 def html_to_pdf(html_content: str) -> bytes:
-    """Convert an HTML string to PDF bytes using pdfkit.
+    """Convert an HTML string to PDF bytes using WeasyPrint.
 
-    Requires wkhtmltopdf to be installed in the container.
+    Rendering happens in-process, so no wkhtmltopdf subprocess is forked per report,
+    and the font configuration is shared across reports.
 
     Args:
         html_content: HTML content to convert.
@@ -513,68 +537,135 @@ def html_to_pdf(html_content: str) -> bytes:
     Returns:
         PDF content as bytes.
     """
-    # pdfkit.from_string returns bytes when output_path=False
-    return pdfkit.from_string(html_content, False)
+    return HTML(string=html_content, base_url=".").write_pdf(font_config=_FONT_CONFIG)
+
+# Only the entity tree is read from extractor responses; masking out the
+# document text and page layout keeps large responses small on the wire
+_ENTITIES_FIELD_MASK = {"paths": ["entities"]}
 
-def _process_single_chunk(data: bytes) -> Dict:
+def _process_single_chunk(data: bytes, gcs_uri: str = "") -> Dict:
     """Process a single PDF chunk through the Document AI Custom Extractor.
 
     Args:
         data: Raw PDF bytes (must be <= MAX_PAGES_PER_CHUNK pages).
+        gcs_uri: Optional gs:// URI of an object holding exactly these bytes. When
+            given, Document AI reads the PDF from Cloud Storage instead of the
+            bytes being sent inline with the request.
 
     Returns:
         Dictionary of extracted field values (flattened from nested structure).
     """
-    client = documentai_beta.DocumentProcessorServiceClient(
-        client_options={"api_endpoint": f"{GEN_EXTRACTOR_LOCATION}-documentai.googleapis.com"}
-    )
+    client = get_docai_client(GEN_EXTRACTOR_LOCATION, beta=True)
     name = f"projects/{PROJECT_ID}/locations/{GEN_EXTRACTOR_LOCATION}/processors/{GEN_EXTRACTOR_ID}"
 
-    raw = documentai_beta.RawDocument(content=data, mime_type="application/pdf")
-    req = documentai_beta.ProcessRequest(name=name, raw_document=raw)
+    if gcs_uri:
+        gcs_document = documentai_beta.GcsDocument(gcs_uri=gcs_uri, mime_type="application/pdf")
+        req = documentai_beta.ProcessRequest(name=name, gcs_document=gcs_document, field_mask=_ENTITIES_FIELD_MASK)
+    else:
+        raw = documentai_beta.RawDocument(content=data, mime_type="application/pdf")
+        req = documentai_beta.ProcessRequest(name=name, raw_document=raw, field_mask=_ENTITIES_FIELD_MASK)
     result = client.process_document(request=req)
 
+    return _entities_to_fields(result.document)
+
+
+def _entities_to_fields(document) -> Dict:
+    """Flatten the entities (and nested properties) of an extractor document into a field dict.
+
+    Proto fields are read directly; unset ones come back as empty strings or
+    messages, so no getattr() fallbacks are needed.
+
+    Walks the entity tree with an explicit stack in the same pre-order a
+    recursive walk would use, so later values still overwrite earlier ones.
+    Children of an entity with no type are skipped.
+    """
     out: Dict = {}
-    
-    def extract_entity_value(entity):
-        """Extract the value from an entity."""
-        val = ""
-        nv = getattr(entity, "normalized_value", None)
-        if nv and getattr(nv, "text", ""):
-            val = (nv.text or "").strip()
-        if not val:
-            val = (getattr(entity, "mention_text", "") or "").strip()
-        return val
-    
-    def process_entity(entity, out_dict):
-        """Recursively process an entity and its nested properties."""
-        key = (getattr(entity, "type_", "") or "").strip()
+    stack = list(reversed(document.entities))
+    while stack:
+        entity = stack.pop()
+        key = entity.type_.strip()
         if not key:
-            return
-        
-        val = extract_entity_value(entity)
+            continue
+        val = entity.normalized_value.text.strip() or entity.mention_text.strip()
         if val:
-            out_dict[key] = val
-        
-        # Process nested child entities (properties)
-        properties = getattr(entity, "properties", None) or []
-        for prop in properties:
-            process_entity(prop, out_dict)
-    
-    for e in (getattr(result.document, "entities", None) or []):
-        process_entity(e, out)
+            out[key] = val
+        # Nested child entities (properties), reversed so they pop in order
+        stack.extend(reversed(entity.properties))
 
     return out
 
 
-def extract_fields_generative(gcs_uri: str) -> Dict:
+def batch_extract_fields(gcs_uris: List[str]) -> List[Dict]:
+    """Extract structured fields from several PDFs with one batch_process_documents call.
+
+    Document AI reads the inputs from Cloud Storage and writes one Document JSON
+    per input (possibly sharded) under a per-run prefix in BUCKET_NAME. Batch
+    requests are not subject to the online page limit, so no chunking is needed.
+
+    Args:
+        gcs_uris: gs:// URIs of the uploaded PDFs.
+
+    Returns:
+        A list of field dictionaries aligned with `gcs_uris`. Inputs the batch
+        could not process map to an empty dict.
+    """
+    if not GEN_EXTRACTOR_ID:
+        return [{} for _ in gcs_uris]
+    if not BUCKET_NAME:
+        raise RuntimeError("BUCKET_NAME must be set in environment variables")
+
+    client = get_docai_client(GEN_EXTRACTOR_LOCATION, beta=True)
+    name = f"projects/{PROJECT_ID}/locations/{GEN_EXTRACTOR_LOCATION}/processors/{GEN_EXTRACTOR_ID}"
+    output_uri = f"gs://{BUCKET_NAME}/{TMP_PREFIX}docai_out/{uuid.uuid4().hex}/"
+
+    req = documentai_beta.BatchProcessRequest(
+        name=name,
+        input_documents=documentai_beta.BatchDocumentsInputConfig(
+            gcs_documents=documentai_beta.GcsDocuments(
+                documents=[documentai_beta.GcsDocument(gcs_uri=uri, mime_type="application/pdf") for uri in gcs_uris]
+            )
+        ),
+        document_output_config=documentai_beta.DocumentOutputConfig(
+            gcs_output_config=documentai_beta.DocumentOutputConfig.GcsOutputConfig(gcs_uri=output_uri)
+        ),
+    )
+    operation = client.batch_process_documents(request=req)
+    operation.result(timeout=BATCH_TIMEOUT_SECONDS)
+
+    # The operation metadata maps each input URI to its output prefix
+    metadata = documentai_beta.BatchProcessMetadata(operation.metadata)
+    bucket = get_storage_client().bucket(BUCKET_NAME)
+    by_input: Dict[str, Dict] = {}
+    for status in metadata.individual_process_statuses:
+        _, _, out_prefix = status.output_gcs_destination.partition(f"gs://{BUCKET_NAME}/")
+        # Outputs live under .../<op_id>/<index>; without the trailing slash,
+        # input 1's prefix would also match the shards of inputs 10, 11, ...
+        out_prefix = out_prefix.rstrip("/") + "/"
+        fields: Dict = {}
+        for blob in bucket.list_blobs(prefix=out_prefix):
+            if not blob.name.endswith(".json"):
+                continue
+            doc = documentai_beta.Document.from_json(blob.download_as_bytes(), ignore_unknown_fields=True)
+            # Merge shards - first non-empty value wins for each key
+            for k, v in _entities_to_fields(doc).items():
+                if k not in fields and v:
+                    fields[k] = v
+        by_input[status.input_gcs_source] = fields
+
+    return [by_input.get(uri, {}) for uri in gcs_uris]
+
+
+def extract_fields_generative(content: bytes, gcs_uri: str = "") -> Dict:
     """Extract structured fields using Document AI Custom Extractor.
 
     For documents exceeding MAX_PAGES_PER_CHUNK pages, the PDF is split into
     smaller chunks, each processed separately, and results are merged.
 
     Args:
-        gcs_uri: GCS URI of the PDF document to process.
+        content: Raw bytes of the PDF document to process.
+        gcs_uri: Optional gs:// URI where `content` is already stored. Documents
+            that fit in one chunk are then read by Document AI from Cloud Storage
+            rather than re-sent inline.
 
     Returns:
         Dictionary of extracted field values merged from all chunks.
@@ -582,39 +673,67 @@ def extract_fields_generative(gcs_uri: str) -> Dict:
     if not GEN_EXTRACTOR_ID:
         return {}
 
-    if not gcs_uri.startswith("gs://"):
-        raise ValueError(f"Expected gs:// URI, got: {gcs_uri}")
-
-    # Parse gs://bucket/object
-    _, _, rest = gcs_uri.partition("gs://")
-    bucket_name, _, blob_name = rest.partition("/")
-    if not bucket_name or not blob_name:
-        raise ValueError(f"Invalid GCS URI: {gcs_uri}")
-
-    # Download bytes from GCS
-    storage_client = get_storage_client()
-    data = storage_client.bucket(bucket_name).blob(blob_name).download_as_bytes()
-
     # Split into chunks if needed
-    chunks = split_pdf_into_chunks(data, MAX_PAGES_PER_CHUNK)
+    chunks = split_pdf_into_chunks(content, MAX_PAGES_PER_CHUNK)
 
     if len(chunks) == 1:
-        # Single chunk - process directly
-        return _process_single_chunk(data)
+        # Single chunk - process directly, from GCS when the upload is already there
+        return _process_single_chunk(content, gcs_uri)
+
+    # Multiple chunks - each is an independent Document AI round-trip, so run
+    # them concurrently on the shared client, then merge in page order
+    with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_CONCURRENT_CHUNKS)) as ex:
+        chunk_results = list(ex.map(_process_single_chunk, chunks))
 
-    # Multiple chunks - process each and merge results
+    # Merge results in page order - first non-empty value wins for each key.
+    # Chunk dicts only hold non-empty values, so no filtering is needed here.
     merged: Dict = {}
-    for chunk_bytes in chunks:
-        chunk_result = _process_single_chunk(chunk_bytes)
-        # Merge results - first non-empty value wins for each key
+    for chunk_result in chunk_results:
         for k, v in chunk_result.items():
-            if k not in merged and v:
-                merged[k] = v
+            merged.setdefault(k, v)
 
     return merged
 
 
 
+# Dashboard score columns and the canonical merged_fields key for each
+_SUMMARY_SCORE_KEYS = {
+    "pursuits": "pursuits score",
+    "saccades": "Saccades Score",
+    "fixations": "Fixations score",
+    "eyeq": "Dysfunctional scale",
+    "standard_percentile": "standard_score_percentile",
+    "proprioception_percentile": "proprioception_score_percentile",
+    "visual_percentile": "visual_score_percentile",
+    "vestibular_percentile": "vestibular_score_percentile",
+    "rpq": "rpq score",
+    "pcl5": "pcl-5 score",
+    "psqi": "psqi score",
+    "phq9": "phq-9 score",
+    "gad7": "gad-7 score",
+}
+
+# Top-level report fields read by /reports
+_REPORT_LIST_FIELDS = [
+    "patient_name", "dob", "doi", "dos", "created_utc", "report_pdf_gcs_uri", "tests_detected", "summary_scores",
+]
+
+def _safe_int(val):
+    if val is None:
+        return None
+    try:
+        return int(float(str(val).replace("%", "").strip()))
+    except (ValueError, TypeError):
+        return None
+
+def summary_scores(merged: Dict) -> Dict:
+    """Pick the dashboard score columns out of merged fields.
+
+    Stored on each report as `summary_scores` so /reports can skip merged_fields.
+    Each column is its canonical _ALIAS_MAP key parsed as an int, else None.
+    """
+    return {column: _safe_int(merged.get(key)) for column, key in _SUMMARY_SCORE_KEYS.items()}
+
 @app.route("/reports", methods=["OPTIONS"])
 def reports_options():
     response = app.make_response("")
@@ -632,30 +751,25 @@ def get_reports():
     """
     db = get_firestore_client()
     limit = min(int(request.args.get("limit", 500)), 1000)
-    reports_ref = db.collection("reports").order_by("created_utc", direction="DESCENDING").limit(limit)
-    docs = reports_ref.stream()
-    
-    def safe_int(val):
-        if val is None:
-            return None
-        try:
-            return int(float(str(val).replace("%", "").strip()))
-        except (ValueError, TypeError):
-            return None
-    
-    def get_score(merged, *keys):
-        for key in keys:
-            val = merged.get(key)
-            if val is not None:
-                result = safe_int(val)
-                if result is not None:
-                    return result
-        return None
+    # Project only the fields the dashboard shows; merged_fields can be large
+    reports_ref = (
+        db.collection("reports")
+        .select(_REPORT_LIST_FIELDS)
+        .order_by("created_utc", direction="DESCENDING")
+        .limit(limit)
+    )
+    rows = [(doc, doc.to_dict() or {}) for doc in reports_ref.stream()]
+
+    # Records written before summary_scores existed only have merged_fields;
+    # read just that field for them, in one batched call
+    legacy_scores = {}
+    legacy_refs = [doc.reference for doc, data in rows if "summary_scores" not in data]
+    if legacy_refs:
+        for snap in db.get_all(legacy_refs, field_paths=["merged_fields"]):
+            legacy_scores[snap.id] = summary_scores((snap.to_dict() or {}).get("merged_fields", {}))
     
     results = []
-    for doc in docs:
-        data = doc.to_dict()
-        merged = data.get("merged_fields", {})
+    for doc, data in rows:
         tests = data.get("tests_detected", {})
         
         record = {
@@ -671,28 +785,26 @@ def get_reports():
                 "ctsib": tests.get("CTSIB", False),
                 "creyos": tests.get("Creyos", False),
             },
-            "scores": {
-                "pursuits": get_score(merged, "pursuits score", "pursuits_score", "Pursuits Score"),
-                "saccades": get_score(merged, "Saccades Score", "saccades_score", "saccades score"),
-                "fixations": get_score(merged, "Fixations score", "fixations_score", "Fixations Score"),
-                "eyeq": get_score(merged, "Dysfunctional scale", "dysfunctional_scale", "EyeQ"),
-                "standard_percentile": get_score(merged, "standard_score_percentile", "Standard Percentile", "standard_percentile"),
-                "proprioception_percentile": get_score(merged, "proprioception_score_percentile", "Proprioception Percentile", "proprioception_percentile"),
-                "visual_percentile": get_score(merged, "visual_score_percentile", "Visual Percentile", "visual_percentile"),
-                "vestibular_percentile": get_score(merged, "vestibular_score_percentile", "Vestibular Percentile", "vestibular_percentile"),
-                "rpq": get_score(merged, "rpq_score", "RPQ Score", "rpq"),
-                "pcl5": get_score(merged, "pcl_5_score", "PCL-5 Score", "pcl5"),
-                "psqi": get_score(merged, "psqi_score", "PSQI Score", "psqi"),
-                "phq9": get_score(merged, "phq_9_score", "PHQ-9 Score", "phq9"),
-                "gad7": get_score(merged, "gad_7_score", "GAD-7 Score", "gad7"),
-            }
+            "scores": data.get("summary_scores") or legacy_scores.get(doc.id) or summary_scores({}),
         }
         results.append(record)
     
-    response = jsonify(results)
+    # Up to 1000 records; orjson encodes them far faster than Flask's stdlib json
+    response = app.response_class(orjson.dumps(results), mimetype="application/json")
     response.headers["Access-Control-Allow-Origin"] = "*"
     return response
 
+# Writes per Firestore WriteBatch (the service limit is 500)
+FIRESTORE_BATCH_SIZE = 450
+# Retry batch commits on transient contention/availability errors
+_FIRESTORE_COMMIT_RETRY = retry.Retry(
+    predicate=retry.if_exception_type(
+        core_exceptions.Aborted,
+        core_exceptions.DeadlineExceeded,
+        core_exceptions.ServiceUnavailable,
+    ),
+)
+
 @app.route("/clear-all-reports", methods=["OPTIONS"])
 def clear_reports_options():
     response = app.make_response("")
@@ -709,12 +821,30 @@ def clear_all_reports():
     """
     db = get_firestore_client()
     reports_ref = db.collection("reports")
-    docs = reports_ref.stream()
-    
-    deleted_count = 0
-    for doc in docs:
-        doc.reference.delete()
-        deleted_count += 1
+    # Only document names are needed, so project onto __name__ and skip fetching
+    # the report bodies (an empty projection would return every field)
+    docs = reports_ref.select([firestore.FieldPath.document_id()]).stream()
+
+    def _delete_batch(refs) -> int:
+        batch = db.batch()
+        for ref in refs:
+            batch.delete(ref)
+        batch.commit(retry=_FIRESTORE_COMMIT_RETRY)
+        return len(refs)
+
+    # Delete in WriteBatches (Firestore allows 500 writes per batch), committing
+    # several batches concurrently while the stream keeps paging
+    futures = []
+    with ThreadPoolExecutor(max_workers=10) as ex:
+        refs = []
+        for doc in docs:
+            refs.append(doc.reference)
+            if len(refs) == FIRESTORE_BATCH_SIZE:
+                futures.append(ex.submit(_delete_batch, refs))
+                refs = []
+        if refs:
+            futures.append(ex.submit(_delete_batch, refs))
+    deleted_count = sum(f.result() for f in futures)
     
     response = jsonify({
         "success": True,
@@ -723,6 +853,194 @@ def clear_all_reports():
     response.headers["Access-Control-Allow-Origin"] = "*"
     return response
 
+# Map common extractor keys (normalized with _norm_key) into the variable names the
+# Jinja template expects. Built once at import rather than per merged file and
+# exposed read-only, since every request shares it.
+_ALIAS_MAP = MappingProxyType({
+    # RightEye
+    "pursuits": "pursuits score",
+    "pursuitsscore": "pursuits score",
+    "saccades": "Saccades Score",
+    "saccadesscore": "Saccades Score",
+    "fixations": "Fixations score",
+    "fixationsscore": "Fixations score",
+    "eyeq": "Dysfunctional scale",
+    "dysfunctionalscale": "Dysfunctional scale",
+    "eyeqscore": "Dysfunctional scale",
+
+    # CTSIB / BTrackS - Path Length (cm) values
+    "standard": "standard_path_length",
+    "standardscore": "standard_path_length",
+    "standardpathlength": "standard_path_length",
+    "proprioception": "proprioception_path_length",
+    "proprioceptionscore": "proprioception_path_length",
+    "proprioceptionpathlength": "proprioception_path_length",
+    "visual": "visual_path_length",
+    "visualscore": "visual_path_length",
+    "visualpathlength": "visual_path_length",
+    "vestibular": "vestibular_path_length",
+    "vestibularscore": "vestibular_path_length",
+    "vestibularpathlength": "vestibular_path_length",
+    # CTSIB / BTrackS - Percentile values (these are what we want for the report)
+    "standardpercentile": "standard_score_percentile",
+    "standardscorepercentile": "standard_score_percentile",
+    "proprioceptionpercentile": "proprioception_score_percentile",
+    "proprioceptionscorepercentile": "proprioception_score_percentile",
+    "visualpercentile": "visual_score_percentile",
+    "visualscorepercentile": "visual_score_percentile",
+    "vestibularpercentile": "vestibular_score_percentile",
+    "vestibularscorepercentile": "vestibular_score_percentile",
+    # Alternative percentile field names (abbreviated)
+    "stdpercentile": "standard_score_percentile",
+    "propercentile": "proprioception_score_percentile",
+    "vispercentile": "visual_score_percentile",
+    "vespercentile": "vestibular_score_percentile",
+    # From baseline results table (STD %, PRO %, VIS %, VES %)
+    "std": "standard_path_length",
+    "pro": "proprioception_path_length",
+    "vis": "visual_path_length",
+    "ves": "vestibular_path_length",
+    # Percentile variations with % column references
+    "percentile1": "standard_score_percentile",
+    "percentile2": "proprioception_score_percentile",
+    "percentile3": "visual_score_percentile",
+    "percentile4": "vestibular_score_percentile",
+    # Baseline percentile fields
+    "baselinestandardpercentile": "standard_score_percentile",
+    "baselineproprioceptionpercentile": "proprioception_score_percentile",
+    "baselinevisualpercentile": "visual_score_percentile",
+    "baselinevestibularpercentile": "vestibular_score_percentile",
+
+    # Creyos screens
+    "rpq": "rpq score",
+    "rpqscore": "rpq score",
+    "pcl5": "pcl-5 score",
+    "pcl5score": "pcl-5 score",
+    "psqi": "psqi score",
+    "psqiscore": "psqi score",
+    "phq9": "phq-9 score",
+    "phq9score": "phq-9 score",
+    "gad7": "gad-7 score",
+    "gad7score": "gad-7 score",
+
+    # Patient fields (if your extractor returns them)
+    "patientname": "patient_name",
+    "patientfullname": "patient_name",
+    "fullname": "patient_name",
+    "name": "patient_name",
+    "dateofbirth": "dob",
+    "birthdate": "dob",
+    "dob": "dob",
+    "dateofinjury": "doi",
+    "injurydate": "doi",
+    "doi": "doi",
+    "dateoftesting": "dos",
+    "dateofservice": "dos",
+    "servicedate": "dos",
+    "testdate": "dos",
+    "testingdate": "dos",
+    "assessmentdate": "dos",
+    "sex": "sex",
+    "gender": "sex",
+    
+    # Creyos cognitive tests
+    "visuospatialworkingmemorytest": "Visuospatial working memory test",
+    "visuospatialworkingmemory": "Visuospatial working memory test",
+    "monkeyladder": "Visuospatial working memory test",
+    "numberladder": "Visuospatial working memory test",
+    "workingmemorytest": "Working memory test",
+    "workingmemory": "Working memory test",
+    "tokensearch": "Working memory test",
+    "spatialshorttermmemorytest": "Spatial short-term memory test",
+    "spatialshorttermmemory": "Spatial short-term memory test",
+    "spatialspan": "Spatial short-term memory test",
+    "verbalshorttermmemory": "Verbal short-term memory",
+    "digitspan": "Verbal short-term memory",
+    "episodicmemory": "Episodic memory",
+    "pairedassociates": "Episodic memory",
+    "polygons": "Polygons",
+    "visuospatialprocessing": "Polygons",
+    "mentalrotation": "Mental Rotation",
+    "rotations": "Mental Rotation",
+    "deductivereasoning": "Deductive Reasoning",
+    "verbalreasoning": "Verbal Reasoning",
+    "grammaticalreasoning": "Verbal Reasoning",
+    "attention": "Attention",
+    "featurematch": "Attention",
+    "planning": "Planning",
+    "spatialplanning": "Planning",
+    "responseinhibition": "Response Inhibition",
+    "doubletrouble": "Response Inhibition",
+    # Creyos per-task percentile fields
+    "visuospatialworkingmemorypercentile": "Visuospatial working memory test",
+    "workingmemorypercentile": "Working memory test",
+    "spatialshorttermmemorypercentile": "Spatial short-term memory test",
+    "verbalshorttermmemorypercentile": "Verbal short-term memory",
+    "episodicmemorypercentile": "Episodic memory",
+    "polygonspercentile": "Polygons",
+    "mentalrotationpercentile": "Mental Rotation",
+    "deductivereasoningpercentile": "Deductive Reasoning",
+    "verbalreasoningpercentile": "Verbal Reasoning",
+    "attentionpercentile": "Attention",
+    "planningpercentile": "Planning",
+    "responseinhibitionpercentile": "Response Inhibition",
+})
+
+def _norm_key(k: str) -> str:
+    """Normalise an extractor key for _ALIAS_MAP lookup: lower-case, alphanumerics only."""
+    return _NONALNUM_RE.sub("", (k or "").lower())
+
+# Keys whose presence in the merged fields means a given test was uploaded
+_VNG_KEYS = frozenset({"pursuits score", "Saccades Score", "Fixations score"})
+_CTSIB_KEYS = frozenset({
+    "standard_score_percentile", "proprioception_score_percentile", "visual_score_percentile", "vestibular_score_percentile",
+    "standard_path_length", "proprioception_path_length", "visual_path_length", "vestibular_path_length",
+})
+_CREYOS_SCORE_KEYS = frozenset({"rpq score", "pcl-5 score", "psqi score", "phq-9 score", "gad-7 score"})
+_CREYOS_DOMAIN_KEYS = frozenset({
+    "attention_percentile", "deductive_reasoning_percentile", "episodic_memory_percentile", "mental_rotation_percentile",
+    "planning_percentile", "polygons_percentile", "response_inhibition_percentile", "spatial_short_term_memory_percentile",
+    "verbal_reasoning_percentile", "verbal_short_term_memory_percentile", "visuospatial_working_memory_percentile",
+    "working_memory_percentile",
+    "Visuospatial working memory test", "Working memory test", "Spatial short-term memory test", "Verbal short-term memory",
+    "Episodic memory", "Polygons", "Mental Rotation", "Deductive Reasoning", "Verbal Reasoning", "Attention", "Planning",
+    "Response Inhibition",
+})
+
+def _upload_object_name(filename: str) -> str:
+    """Return a unique object name for an uploaded source PDF.
+
+    Document AI reads the PDF back from Cloud Storage, so two requests that
+    upload the same filename must not share (and overwrite) one object.
+    """
+    return f"uploads/{uuid.uuid4().hex}/{filename}"
+
+def _upload_file(upload: tuple) -> str:
+    """Upload one (filename, bytes) pair to GCS under a unique name and return its URI."""
+    filename, data = upload
+    return upload_bytes_to_bucket(data, _upload_object_name(filename), content_type="application/pdf")
+
+def _handle_file(upload: tuple) -> tuple:
+    """Upload one (filename, bytes) pair to GCS and extract its fields.
+
+    Runs on the /upload worker pool. Extraction errors are returned rather than
+    raised so one bad file does not fail the whole request.
+
+    Returns:
+        (blob_uri, gen_fields, error) where `error` is "" on success.
+    """
+    _, data = upload
+    blob_uri = _upload_file(upload)
+    # Extract fields from your generative extractor (this is the source of truth for numbers)
+    try:
+        return blob_uri, extract_fields_generative(data, gcs_uri=blob_uri), ""
+    except Exception as e:
+        return blob_uri, None, f"extract_fields_generative failed: {e}"
+
+@app.errorhandler(413)
+def request_too_large(_error):
+    return jsonify({"error": f"Upload exceeds the {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB limit"}), 413
+
 @app.route("/upload", methods=["OPTIONS"])
 def upload_options():
     response = app.make_response("")
@@ -737,6 +1055,13 @@ def upload_endpoint() -> tuple:
     Upload 1–3 PDFs (RightEye, CTSIB/BTrackS, Creyos) and generate ONE comprehensive interpretation report.
     Numbers/values are pulled from the documents via generative extraction. Sections are omitted if a test isn't present.
     """
+    # Without an extractor every file would be uploaded only to yield no fields
+    if not GEN_EXTRACTOR_ID:
+        return jsonify({"error": "Extractor not configured (set GEN_EXTRACTOR_ID)"}), 503
+
+    # One timestamp per request so the PDF/HTML names and created_utc agree
+    now = datetime.utcnow()
+
     if "files" not in request.files:
         return jsonify({"error": "No files part in the request"}), 400
 
@@ -750,156 +1075,45 @@ def upload_endpoint() -> tuple:
     file_results = []
     first_blob_uri = ""
 
-    def _norm(k: str) -> str:
-        import re
-        return re.sub(r"[^a-z0-9]+", "", (k or "").lower())
-
     def _merge_fields(target: Dict, incoming: Dict) -> None:
         incoming = incoming or {}
 
-        # Keep all original keys (so we can debug easily)
         for k, v in incoming.items():
             if v is None or v == "":
                 continue
+            # Keep all original keys (so we can debug easily)
             target.setdefault(k, v)
-
-        # Map common extractor keys into the variable names your Jinja template expects
-        alias_map = {
-            # RightEye
-            "pursuits": "pursuits score",
-            "pursuitsscore": "pursuits score",
-            "saccades": "Saccades Score",
-            "saccadesscore": "Saccades Score",
-            "fixations": "Fixations score",
-            "fixationsscore": "Fixations score",
-            "eyeq": "Dysfunctional scale",
-            "dysfunctionalscale": "Dysfunctional scale",
-            "eyeqscore": "Dysfunctional scale",
-
-            # CTSIB / BTrackS - Path Length (cm) values
-            "standard": "standard_path_length",
-            "standardscore": "standard_path_length",
-            "standardpathlength": "standard_path_length",
-            "proprioception": "proprioception_path_length",
-            "proprioceptionscore": "proprioception_path_length",
-            "proprioceptionpathlength": "proprioception_path_length",
-            "visual": "visual_path_length",
-            "visualscore": "visual_path_length",
-            "visualpathlength": "visual_path_length",
-            "vestibular": "vestibular_path_length",
-            "vestibularscore": "vestibular_path_length",
-            "vestibularpathlength": "vestibular_path_length",
-            # CTSIB / BTrackS - Percentile values (these are what we want for the report)
-            "standardpercentile": "standard_score_percentile",
-            "standardscorepercentile": "standard_score_percentile",
-            "proprioceptionpercentile": "proprioception_score_percentile",
-            "proprioceptionscorepercentile": "proprioception_score_percentile",
-            "visualpercentile": "visual_score_percentile",
-            "visualscorepercentile": "visual_score_percentile",
-            "vestibularpercentile": "vestibular_score_percentile",
-            "vestibularscorepercentile": "vestibular_score_percentile",
-            # Alternative percentile field names (abbreviated)
-            "stdpercentile": "standard_score_percentile",
-            "propercentile": "proprioception_score_percentile",
-            "vispercentile": "visual_score_percentile",
-            "vespercentile": "vestibular_score_percentile",
-            # From baseline results table (STD %, PRO %, VIS %, VES %)
-            "std": "standard_path_length",
-            "pro": "proprioception_path_length",
-            "vis": "visual_path_length",
-            "ves": "vestibular_path_length",
-            # Percentile variations with % column references
-            "percentile1": "standard_score_percentile",
-            "percentile2": "proprioception_score_percentile",
-            "percentile3": "visual_score_percentile",
-            "percentile4": "vestibular_score_percentile",
-            # Baseline percentile fields
-            "baselinestandardpercentile": "standard_score_percentile",
-            "baselineproprioceptionpercentile": "proprioception_score_percentile",
-            "baselinevisualpercentile": "visual_score_percentile",
-            "baselinevestibularpercentile": "vestibular_score_percentile",
-
-            # Creyos screens
-            "rpq": "rpq score",
-            "rpqscore": "rpq score",
-            "pcl5": "pcl-5 score",
-            "pcl5score": "pcl-5 score",
-            "psqi": "psqi score",
-            "psqiscore": "psqi score",
-            "phq9": "phq-9 score",
-            "phq9score": "phq-9 score",
-            "gad7": "gad-7 score",
-            "gad7score": "gad-7 score",
-
-            # Patient fields (if your extractor returns them)
-            "patientname": "patient_name",
-            "patientfullname": "patient_name",
-            "fullname": "patient_name",
-            "name": "patient_name",
-            "dateofbirth": "dob",
-            "birthdate": "dob",
-            "dob": "dob",
-            "dateofinjury": "doi",
-            "injurydate": "doi",
-            "doi": "doi",
-            "dateoftesting": "dos",
-            "dateofservice": "dos",
-            "servicedate": "dos",
-            "testdate": "dos",
-            "testingdate": "dos",
-            "assessmentdate": "dos",
-            "sex": "sex",
-            "gender": "sex",
-            
-            # Creyos cognitive tests
-            "visuospatialworkingmemorytest": "Visuospatial working memory test",
-            "visuospatialworkingmemory": "Visuospatial working memory test",
-            "monkeyladder": "Visuospatial working memory test",
-            "numberladder": "Visuospatial working memory test",
-            "workingmemorytest": "Working memory test",
-            "workingmemory": "Working memory test",
-            "tokensearch": "Working memory test",
-            "spatialshorttermmemorytest": "Spatial short-term memory test",
-            "spatialshorttermmemory": "Spatial short-term memory test",
-            "spatialspan": "Spatial short-term memory test",
-            "verbalshorttermmemory": "Verbal short-term memory",
-            "digitspan": "Verbal short-term memory",
-            "episodicmemory": "Episodic memory",
-            "pairedassociates": "Episodic memory",
-            "polygons": "Polygons",
-            "visuospatialprocessing": "Polygons",
-            "mentalrotation": "Mental Rotation",
-            "rotations": "Mental Rotation",
-            "deductivereasoning": "Deductive Reasoning",
-            "verbalreasoning": "Verbal Reasoning",
-            "grammaticalreasoning": "Verbal Reasoning",
-            "attention": "Attention",
-            "featurematch": "Attention",
-            "planning": "Planning",
-            "spatialplanning": "Planning",
-            "responseinhibition": "Response Inhibition",
-            "doubletrouble": "Response Inhibition",
-        }
-
-        norm_in = {_norm(k): v for k, v in incoming.items() if v not in (None, "")}
-        for nk, out_key in alias_map.items():
-            if nk in norm_in:
-                target.setdefault(out_key, norm_in[nk])
-
+            # A literal key always takes precedence over an alias that maps
+            # onto it, so skip the alias when that key has its own value here
+            out_key = _ALIAS_MAP.get(_norm_key(k))
+            if out_key and incoming.get(out_key) in (None, ""):
+                target.setdefault(out_key, v)
+
+    # Werkzeug file streams are not thread-safe, so read every upload here and
+    # hand plain bytes to the workers. Uploads and Document AI calls are I/O
+    # bound, so running the files concurrently cuts latency to the slowest file.
+    uploads = []
     for file_storage in files:
-        filename = file_storage.filename or "document"
-
-        # Upload file to GCS
         file_storage.stream.seek(0)
-        blob_uri = upload_to_bucket(file_storage.stream, filename)
+        uploads.append((file_storage.filename or "document", file_storage.stream.read()))
+
+    with ThreadPoolExecutor(max_workers=min(len(uploads), MAX_CONCURRENT_FILES)) as ex:
+        if USE_BATCH_EXTRACTION and len(uploads) > 1:
+            # Upload everything, then extract all files in one batch request
+            blob_uris = list(ex.map(_upload_file, uploads))
+            try:
+                results = [(uri, fields, "") for uri, fields in zip(blob_uris, batch_extract_fields(blob_uris))]
+            except Exception as e:
+                results = [(uri, None, f"batch_extract_fields failed: {e}") for uri in blob_uris]
+        else:
+            results = list(ex.map(_handle_file, uploads))
+
+    # Merge on this thread, in upload order, so "first value wins" stays deterministic
+    for (filename, _), (blob_uri, gen_fields, error) in zip(uploads, results):
         if not first_blob_uri:
             first_blob_uri = blob_uri
-
-        # Extract fields from your generative extractor (this is the source of truth for numbers)
-        try:
-            gen_fields = extract_fields_generative(blob_uri)
-        except Exception as e:
-            file_results.append({"filename": filename, "error": f"extract_fields_generative failed: {e}"})
+        if error:
+            file_results.append({"filename": filename, "error": error})
             continue
 
         _merge_fields(merged_fields, gen_fields)
@@ -914,9 +1128,9 @@ def upload_endpoint() -> tuple:
     sex = request.form.get("sex") or merged_fields.get("sex") or ""
 
     # Auto-detect which tests are present
-    vng = any(k in merged_fields for k in ("pursuits score", "Saccades Score", "Fixations score"))
-    ct_sib = any(k in merged_fields for k in ("standard_score_percentile", "proprioception_score_percentile", "visual_score_percentile", "vestibular_score_percentile", "standard_path_length", "proprioception_path_length", "visual_path_length", "vestibular_path_length"))
-    creyos = any(k in merged_fields for k in ("rpq score", "pcl-5 score", "psqi score", "phq-9 score", "gad-7 score")) or any(k in merged_fields for k in ("attention_percentile","deductive_reasoning_percentile","episodic_memory_percentile","mental_rotation_percentile","planning_percentile","polygons_percentile","response_inhibition_percentile","spatial_short_term_memory_percentile","verbal_reasoning_percentile","verbal_short_term_memory_percentile","visuospatial_working_memory_percentile","working_memory_percentile","Visuospatial working memory test","Working memory test","Spatial short-term memory test","Verbal short-term memory","Episodic memory","Polygons","Mental Rotation","Deductive Reasoning","Verbal Reasoning","Attention","Planning","Response Inhibition"))
+    vng = not _VNG_KEYS.isdisjoint(merged_fields)
+    ct_sib = not _CTSIB_KEYS.isdisjoint(merged_fields)
+    creyos = not _CREYOS_SCORE_KEYS.isdisjoint(merged_fields) or not _CREYOS_DOMAIN_KEYS.isdisjoint(merged_fields)
 
     # Render ONE final report
     html_report = render_report(
@@ -929,33 +1143,53 @@ def upload_endpoint() -> tuple:
         ct_sib=ct_sib,
         creyos=creyos,
         sex=sex,
+        now=now,
     )
 
-    # Convert HTML to PDF and upload
-    pdf_gcs_uri = ""
-    try:
-        pdf_bytes = html_to_pdf(html_report)
-        pdf_blob_name = f"interpretation_report_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_gcs_uri = upload_bytes_to_bucket(pdf_bytes, pdf_blob_name, content_type="application/pdf")
-    except Exception:
+    # Convert HTML to PDF and upload. Requests run concurrently, so the object
+    # names carry the report id to keep same-second reports from colliding.
+    doc_ref = db.collection("reports").document()
+    report_stem = f"interpretation_report_{now.strftime('%Y%m%d_%H%M%S')}_{doc_ref.id}"
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        # Keep the HTML in GCS too; Firestore only stores its URI (documents are capped at 1 MiB).
+        # It doesn't depend on the PDF, so upload it while WeasyPrint renders.
+        html_upload = ex.submit(upload_bytes_to_bucket, html_report.encode("utf-8"), f"{report_stem}.html", content_type="text/html")
+
         pdf_gcs_uri = ""
+        try:
+            pdf_bytes = html_to_pdf(html_report)
+            pdf_gcs_uri = upload_bytes_to_bucket(pdf_bytes, f"{report_stem}.pdf", content_type="application/pdf")
+        except Exception:
+            pdf_gcs_uri = ""
 
-    # Store one combined record
-    db.collection("reports").add({
+        html_gcs_uri = ""
+        try:
+            html_gcs_uri = html_upload.result()
+        except Exception:
+            html_gcs_uri = ""
+
+    # Store one combined record. The write stays on the request thread: Cloud Run
+    # throttles CPU once the response is sent, so a background write could stall
+    # or be lost, leaving the client with a report_id that never exists.
+    doc_ref.set({
         "source_files": [fr.get("filename") for fr in file_results],
         "first_gcs_uri": first_blob_uri,
         "merged_fields": merged_fields,
-        "report_html": html_report,
+        "summary_scores": summary_scores(merged_fields),
+        "report_html_gcs_uri": html_gcs_uri,
         "report_pdf_gcs_uri": pdf_gcs_uri,
         "patient_name": patient_name,
         "dob": dob,
         "doi": doi,
         "dos": dos,
         "tests_detected": {"VNG": vng, "CTSIB": ct_sib, "Creyos": creyos},
-        "created_utc": datetime.utcnow().isoformat() + "Z",
+        "created_utc": now.isoformat() + "Z",
     })
 
-    return jsonify({
+    # The payload carries merged_fields and the full report HTML; encode it with
+    # orjson like /reports does
+    payload = {
+        "report_id": doc_ref.id,
         "source_files": [fr.get("filename") for fr in file_results],
         "file_results": file_results,
         "tests_detected": {"VNG": vng, "CTSIB": ct_sib, "Creyos": creyos},
@@ -963,7 +1197,8 @@ def upload_endpoint() -> tuple:
         "merged_fields": merged_fields,
         "report_html": html_report,
         "report_pdf_gcs_uri": pdf_gcs_uri,
-    }), 200
+    }
+    return app.response_class(orjson.dumps(payload), mimetype="application/json"), 200
 
 
 if __name__ == "__main__":
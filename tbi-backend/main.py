@@ -1,12 +1,14 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 from googleapiclient.discovery import build
 from google.cloud import documentai_v1 as documentai
 from google.auth import default
-from io import BytesIO
-from googleapiclient.http import MediaIoBaseDownload
+from collections import OrderedDict
+import hashlib
 import os
-import json
+import orjson
+import threading
 
 import vertexai
 from vertexai.generative_models import GenerativeModel
@@ -23,12 +25,33 @@ DOC_PROCESSOR_ID = os.environ.get("DOC_AI_PROCESSOR_ID")  # e.g. 26145f8a54ef762
 VERTEX_LOCATION = os.environ.get("VERTEX_LOCATION", "us-central1")
 GEMINI_MODEL_NAME = os.environ.get("GEMINI_MODEL_NAME", "gemini-1.5-pro")
 
+# Gemini responses kept in memory, keyed by a hash of the OCR text, so
+# re-submitting the same report doesn't pay for another model call
+CTSIB_CACHE_SIZE = int(os.environ.get("CTSIB_CACHE_SIZE", "256"))
+
 
 # ---------- DRIVE HELPERS ----------
 
+# Credential discovery and building the Drive service are slow, so do them
+# once. The service's httplib2 transport isn't thread-safe, so each thread
+# gets its own service built from the shared credentials.
+_drive_creds = None
+_drive_local = threading.local()
+_drive_lock = threading.Lock()
+
+
 def get_drive_client():
-    creds, _ = default(scopes=["https://www.googleapis.com/auth/drive.readonly"])
-    return build("drive", "v3", credentials=creds)
+    global _drive_creds
+    drive = getattr(_drive_local, "drive", None)
+    if drive is None:
+        if _drive_creds is None:
+            with _drive_lock:
+                if _drive_creds is None:
+                    _drive_creds, _ = default(scopes=["https://www.googleapis.com/auth/drive.readonly"])
+        # The bundled discovery doc is used, so skip the discovery file cache
+        drive = build("drive", "v3", credentials=_drive_creds, cache_discovery=False)
+        _drive_local.drive = drive
+    return drive
 
 
 def download_pdf_from_drive(file_id: str) -> bytes:
@@ -38,23 +61,35 @@ def download_pdf_from_drive(file_id: str) -> bytes:
         supportsAllDrives=True,  # important for Shared Drives
     )
 
-    fh = BytesIO()
-    downloader = MediaIoBaseDownload(fh, request)
-    done = False
-    while not done:
-        status, done = downloader.next_chunk()
-    return fh.getvalue()
+    # Report PDFs are far below MediaIoBaseDownload's 100 MB default chunk, so
+    # its loop was always one GET; execute() returns that body as bytes
+    # directly, without staging it in a BytesIO and copying it back out.
+    return request.execute()
 
 
 # ---------- DOCUMENT AI OCR ----------
 
+# The Document AI client owns a gRPC channel and is thread-safe; build it once
+_docai_client = None
+_docai_lock = threading.Lock()
+
+
+def get_docai_client() -> documentai.DocumentProcessorServiceClient:
+    global _docai_client
+    if _docai_client is None:
+        with _docai_lock:
+            if _docai_client is None:
+                _docai_client = documentai.DocumentProcessorServiceClient()
+    return _docai_client
+
+
 def run_document_ocr(pdf_bytes: bytes) -> str:
     if not PROJECT_ID:
         raise RuntimeError("GOOGLE_CLOUD_PROJECT env var is not set.")
     if not DOC_PROCESSOR_ID:
         raise RuntimeError("DOC_AI_PROCESSOR_ID env var is not set.")
 
-    client = documentai.DocumentProcessorServiceClient()
+    client = get_docai_client()
     name = client.processor_path(PROJECT_ID, DOC_PROCESSOR_LOCATION, DOC_PROCESSOR_ID)
 
     raw_document = documentai.RawDocument(
@@ -71,8 +106,8 @@ def run_document_ocr(pdf_bytes: bytes) -> str:
 
 # ---------- GEMINI PROMPT FOR CTSIB ----------
 
-def build_ctsib_prompt(ocr_text: str) -> str:
-    return f"""
+# Built once at import; only the OCR text changes between requests
+_CTSIB_PROMPT_TEMPLATE = """
 You are an assistant that extracts structured numerical CTSIB (Clinical Test of Sensory Interaction on Balance) results.
 
 The input is OCR text from a CTSIB report. The report always contains four baseline conditions:
@@ -85,11 +120,11 @@ The input is OCR text from a CTSIB report. The report always contains four basel
 Extract the following fields:
 
 For each condition, return:
-{{
+{
   "label": "EO_FIRM" | "EC_FIRM" | "EO_FOAM" | "EC_FOAM",
   "path_length_cm": number | null,
   "percentile": number | null
-}}
+}
 
 Where the mapping is:
 - Standard (Eyes Open/Firm) -> EO_FIRM
@@ -115,31 +150,63 @@ RULES:
 
 Return a SINGLE JSON object with this schema:
 
-{{
+{
   "test_type": "CTSIB",
   "conditions": [
-    {{
+    {
       "label": "...",
       "path_length_cm": ...,
       "percentile": ...
-    }}
+    }
   ],
   "composite_path_length_cm": ...,
   "summary_flags": [ ... ]
-}}
+}
 
 Here is the OCR text of the CTSIB report:
 
 <<<REPORT_TEXT>>>
-""".replace("<<<REPORT_TEXT>>>", ocr_text)
+"""
+_CTSIB_PROMPT_PREFIX, _, _CTSIB_PROMPT_SUFFIX = _CTSIB_PROMPT_TEMPLATE.partition("<<<REPORT_TEXT>>>")
+
+
+def build_ctsib_prompt(ocr_text: str) -> str:
+    return "".join((_CTSIB_PROMPT_PREFIX, ocr_text, _CTSIB_PROMPT_SUFFIX))
+
+
+_ctsib_cache = OrderedDict()
+_ctsib_cache_lock = threading.Lock()
+
+# vertexai.init() and GenerativeModel() set up auth and model metadata, so
+# build the model once on first use and share it across requests
+_gemini_model = None
+_gemini_model_lock = threading.Lock()
+
+
+def get_gemini_model() -> GenerativeModel:
+    global _gemini_model
+    if _gemini_model is None:
+        with _gemini_model_lock:
+            if _gemini_model is None:
+                vertexai.init(project=PROJECT_ID, location=VERTEX_LOCATION)
+                _gemini_model = GenerativeModel(GEMINI_MODEL_NAME)
+    return _gemini_model
 
 
 def extract_ctsib_from_text(ocr_text: str) -> dict:
     if not PROJECT_ID:
         raise RuntimeError("GOOGLE_CLOUD_PROJECT env var is not set for Gemini.")
 
-    vertexai.init(project=PROJECT_ID, location=VERTEX_LOCATION)
-    model = GenerativeModel(GEMINI_MODEL_NAME)
+    # Cache the raw JSON text rather than the dict so every caller gets its own copy
+    key = hashlib.blake2b(ocr_text.encode("utf-8"), digest_size=16).hexdigest()
+    with _ctsib_cache_lock:
+        raw_text = _ctsib_cache.get(key)
+        if raw_text is not None:
+            _ctsib_cache.move_to_end(key)
+    if raw_text is not None:
+        return orjson.loads(raw_text)
+
+    model = get_gemini_model()
 
     prompt = build_ctsib_prompt(ocr_text)
     response = model.generate_content(prompt)
@@ -151,12 +218,37 @@ def extract_ctsib_from_text(ocr_text: str) -> dict:
         raw_text = response.candidates[0].content.parts[0].text
 
     raw_text = raw_text.strip()
-    data = json.loads(raw_text)
+    data = orjson.loads(raw_text)
+
+    # Only responses that parsed are cached; failures are retried next time
+    with _ctsib_cache_lock:
+        _ctsib_cache[key] = raw_text
+        if len(_ctsib_cache) > CTSIB_CACHE_SIZE:
+            _ctsib_cache.popitem(last=False)
     return data
 
 
 # ---------- CTSIB VALIDATION ----------
 
+# Severity of each validation status; a check can only raise the status
+_STATUS_ORDER = {"ok": 0, "needs_review": 1, "invalid": 2}
+
+_EXPECTED_LABELS = frozenset({"EO_FIRM", "EC_FIRM", "EO_FOAM", "EC_FOAM"})
+
+
+def _as_number(value):
+    """Return `value` as a number, or None if it isn't numeric.
+
+    Gemini usually emits real JSON numbers, so those skip float() and its
+    exception path; only string values are converted."""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def validate_ctsib(ctsib: dict) -> dict:
     """
     Apply sanity checks to CTSIB JSON.
@@ -165,70 +257,71 @@ def validate_ctsib(ctsib: dict) -> dict:
     warnings = []
     status = "ok"
 
-    expected_labels = {"EO_FIRM", "EC_FIRM", "EO_FOAM", "EC_FOAM"}
+    def escalate(new_status: str) -> None:
+        nonlocal status
+        if _STATUS_ORDER[new_status] > _STATUS_ORDER[status]:
+            status = new_status
+
     conditions = ctsib.get("conditions") or []
 
     # Ensure test_type
     if ctsib.get("test_type") != "CTSIB":
         warnings.append("test_type is not CTSIB")
-        status = "needs_review"
+        escalate("needs_review")
 
-    # Check that all four labels appear
+    # One pass over conditions: collect labels and range-check values. Range
+    # warnings are reported after the missing-conditions warning, as before.
     seen_labels = set()
+    range_warnings = []
     for cond in conditions:
         lbl = cond.get("label")
         if lbl:
             seen_labels.add(lbl)
-    missing = expected_labels - seen_labels
-    if missing:
-        warnings.append(f"Missing conditions: {', '.join(sorted(missing))}")
-        status = "needs_review"
-
-    # Range checks for each condition
-    for cond in conditions:
-        lbl = cond.get("label", "UNKNOWN")
+        lbl = lbl or "UNKNOWN"
         pl = cond.get("path_length_cm")
         pct = cond.get("percentile")
 
         if pl is not None:
-            try:
-                pl_val = float(pl)
-                if not (0 <= pl_val <= 1000):
-                    warnings.append(f"{lbl}: path_length_cm out of expected range (0–1000): {pl}")
-                    status = "needs_review"
-            except Exception:
-                warnings.append(f"{lbl}: path_length_cm is not numeric: {pl}")
-                status = "needs_review"
+            pl_val = _as_number(pl)
+            if pl_val is None:
+                range_warnings.append(f"{lbl}: path_length_cm is not numeric: {pl}")
+            elif not (0 <= pl_val <= 1000):
+                range_warnings.append(f"{lbl}: path_length_cm out of expected range (0–1000): {pl}")
 
         if pct is not None:
-            try:
-                pct_val = float(pct)
-                if not (0 <= pct_val <= 100):
-                    warnings.append(f"{lbl}: percentile out of expected range (0–100): {pct}")
-                    status = "needs_review"
-            except Exception:
-                warnings.append(f"{lbl}: percentile is not numeric: {pct}")
-                status = "needs_review"
+            pct_val = _as_number(pct)
+            if pct_val is None:
+                range_warnings.append(f"{lbl}: percentile is not numeric: {pct}")
+            elif not (0 <= pct_val <= 100):
+                range_warnings.append(f"{lbl}: percentile out of expected range (0–100): {pct}")
+
+    # Check that all four labels appear
+    missing = _EXPECTED_LABELS - seen_labels
+    if missing:
+        warnings.append(f"Missing conditions: {', '.join(sorted(missing))}")
+        escalate("needs_review")
+    if range_warnings:
+        warnings.extend(range_warnings)
+        escalate("needs_review")
 
     # Composite checks
     comp = ctsib.get("composite_path_length_cm")
     if comp is not None:
-        try:
-            comp_val = float(comp)
-            if not (0 <= comp_val <= 4000):
-                warnings.append(f"Composite path length out of range (0–4000): {comp}")
-                status = "needs_review"
-        except Exception:
+        comp_val = _as_number(comp)
+        if comp_val is None:
             warnings.append(f"Composite path length is not numeric: {comp}")
-            status = "needs_review"
+            escalate("needs_review")
+        elif not (0 <= comp_val <= 4000):
+            warnings.append(f"Composite path length out of range (0–4000): {comp}")
+            escalate("needs_review")
     else:
         warnings.append("Composite path length missing.")
-        status = max(status, "needs_review")
+        escalate("needs_review")
 
     # If JSON is obviously broken
     if not isinstance(conditions, list) or not conditions:
         warnings.append("conditions is missing or not a list.")
-        status = "invalid"
+        escalate("invalid")
 
     return {
         "status": status,
@@ -246,11 +339,15 @@ async def process_test(request: Request):
     patient_id = payload.get("patientId", "")
     dos_date = payload.get("dosDate", "")
 
+    # The Drive, Document AI and Gemini clients are blocking, so run them on
+    # the threadpool; awaiting them keeps the event loop free to serve other
+    # requests meanwhile.
+
     # 1. Download PDF from Drive
-    pdf_bytes = download_pdf_from_drive(file_id)
+    pdf_bytes = await run_in_threadpool(download_pdf_from_drive, file_id)
 
     # 2. OCR via Document AI
-    ocr_text = run_document_ocr(pdf_bytes)
+    ocr_text = await run_in_threadpool(run_document_ocr, pdf_bytes)
 
     result = {
         "status": "ok",
@@ -261,7 +358,7 @@ async def process_test(request: Request):
     # 3. If CTSIB, run Gemini extraction + validation
     if test_type == "CTSIB":
         try:
-            ctsib_data = extract_ctsib_from_text(ocr_text)
+            ctsib_data = await run_in_threadpool(extract_ctsib_from_text, ocr_text)
             validation = validate_ctsib(ctsib_data)
             result["ctsib"] = ctsib_data
             result["ctsibValidation"] = validation
@@ -275,7 +372,8 @@ async def process_test(request: Request):
         f"test={test_type}, chars={len(ocr_text)}"
     )
 
-    return result
+    # orjson encodes the body much faster than FastAPI's default JSON encoding
+    return Response(orjson.dumps(result), media_type="application/json")
 
 
 if __name__ == "__main__":